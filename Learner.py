@@ -1,17 +1,21 @@
+import os
 import json
 import re
 import logging
 from typing import List, Dict, Optional
 import groq
+from question_index import QuestionIndex
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class AssessmentEngine:
-    def __init__(self) -> None:
+    def __init__(self, question_index: Optional[QuestionIndex] = None, index_path: Optional[str] = None) -> None:
         self.api_key = self._get_api_key()
         self.client = groq.Client(api_key=self.api_key)
+        self.index_path = index_path or os.environ.get('QUESTION_INDEX_PATH')
+        self.question_index = question_index if question_index is not None else self._load_question_index(self.index_path)
 
     @staticmethod
     def _get_api_key() -> str:
@@ -20,6 +24,23 @@ class AssessmentEngine:
             raise ValueError("API key not found. Please set the GROQ_API_KEY environment variable.")
         return api_key
 
+    @staticmethod
+    def _load_question_index(path: Optional[str]) -> QuestionIndex:
+        if path and os.path.exists(path):
+            try:
+                return QuestionIndex.load(path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Error loading question index from {path}, starting a new one: {e}")
+        return QuestionIndex()
+
+    def _save_question_index(self) -> None:
+        if not self.index_path:
+            return
+        try:
+            self.question_index.flush(self.index_path)
+        except OSError as e:
+            logger.error(f"Error saving question index to {self.index_path}: {e}")
+
     def get_user_level(self) -> str:
         valid_levels = {'a': 'Beginner', 'b': 'Intermediate', 'c': 'Advanced'}
         while True:
@@ -28,25 +49,19 @@ class AssessmentEngine:
                 return valid_levels[skill_level]
             logger.warning("Invalid input. Please enter a, b, or c.")
 
-    def question_generator(self, skill_level: str) -> Optional[List[Dict]]:
-        """
-        Generate multiple-choice questions using the Groq API.
-
-        Args:
-            skill_level (str): The user's skill level.
-
-        Returns:
-            Optional[List[Dict]]: A list of questions with options and correct answers, or None if an error occurs.
-        """
+    def _request_questions(self, skill_level: str, count: int, temperature: float,
+                           avoid: List[str]) -> Optional[List[Dict]]:
+        prompt = f"Generate {count} multiple-choice questions on the Hindi Language for {skill_level} level. Each question should have 4 options (a, b, c, d) and include the correct answer. Format the output as a JSON array of objects with keys: 'text' for the question, 'choices' for options, and 'answer' for the correct answer."
+        if avoid:
+            prompt += " Do not repeat or reword any of these questions:\n" + "\n".join(f"- {text}" for text in avoid)
         try:
-            logger.info(f"Generating questions for {skill_level} level...")
             response = self.client.chat.completions.create(
                 model="mixtral-8x7b-32768",
                 messages=[{
                     "role": "user",
-                    "content": f"Generate 10 multiple-choice questions on the Hindi Language for {skill_level} level. Each question should have 4 options (a, b, c, d) and include the correct answer. Format the output as a JSON array of objects with keys: 'text' for the question, 'choices' for options, and 'answer' for the correct answer."
+                    "content": prompt
                 }],
-                temperature=0
+                temperature=temperature
             )
             logger.info("Received response from API.")
             logger.debug(f"Raw API response: {response.choices[0].message.content}")
@@ -55,6 +70,9 @@ class AssessmentEngine:
                 if not isinstance(questions, list):
                     logger.error("API response is not a JSON array as expected.")
                     return None
+                if not all(isinstance(q, dict) for q in questions):
+                    logger.error("API response contains items that are not JSON objects.")
+                    return None
                 return questions
             except json.JSONDecodeError as e:
                 logger.error(f"Error parsing JSON response: {e}")
@@ -65,6 +83,58 @@ class AssessmentEngine:
             logger.error(f"Error making API request: {e}")
             return None
 
+    def question_generator(self, skill_level: str, num_questions: int = 10, max_attempts: int = 3) -> Optional[List[Dict]]:
+        """
+        Generate multiple-choice questions using the Groq API.
+
+        Near-duplicates of previously generated questions are rejected via the question index,
+        and replacements are requested, up to `max_attempts` requests in total. If there are
+        still not enough new questions, previously seen ones fill the remaining slots, so a
+        valid response never turns into an empty quiz.
+
+        Args:
+            skill_level (str): The user's skill level.
+            num_questions (int): The number of questions to return.
+            max_attempts (int): The maximum number of API requests.
+
+        Returns:
+            Optional[List[Dict]]: A list of questions with options and correct answers, or None if an error occurs.
+
+        Raises:
+            ValueError: If max_attempts is less than 1.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        logger.info(f"Generating questions for {skill_level} level...")
+        accepted: List[Dict] = []
+        duplicates: List[Dict] = []
+        for attempt in range(max_attempts):
+            avoid = [q['text'] for q in accepted + duplicates if q.get('text')][-20:]
+            # Retries use a changed prompt and some randomness, otherwise the same batch comes back
+            batch = self._request_questions(skill_level, num_questions - len(accepted),
+                                            temperature=0 if attempt == 0 else 0.2, avoid=avoid)
+            if batch is None:
+                if attempt == 0:
+                    return None
+                break
+            for q in batch:
+                if len(accepted) >= num_questions:
+                    break
+                (accepted if self.question_index.add(q) else duplicates).append(q)
+            if len(accepted) >= num_questions:
+                break
+            logger.info(f"{len(duplicates)} near-duplicate question(s) rejected so far, "
+                        f"requesting {num_questions - len(accepted)} more.")
+
+        if len(accepted) < num_questions and duplicates:
+            reused = duplicates[:num_questions - len(accepted)]
+            logger.warning(f"Only {len(accepted)} new question(s) after {attempt + 1} request(s), "
+                           f"reusing {len(reused)} previously generated question(s).")
+            accepted.extend(reused)
+
+        self._save_question_index()
+        return accepted
+
     def collect_user_responses(self, questions: List[Dict]) -> List[str]:
         user_responses = []
         for i, q in enumerate(questions, 1):
@@ -0,0 +1,663 @@
+import os
+import json
+import re
+import time
+import random
+import string
+import struct
+import hashlib
+import logging
+import operator
+import tempfile
+import threading
+import tracemalloc
+import unicodedata
+from array import array
+from collections import Counter
+from typing import List, Dict, Optional, Iterable, Tuple, NamedTuple, Iterator
+
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_QUOTED = re.compile(r"(?<!\w)['\"‘“]([^'\"‘’“”]+)['\"’”](?!\w)")
+_PARENTHESIZED = re.compile(r"\(([^()]*)\)")
+_OPTION_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+_FORMAT_VERSION = 1
+
+
+def _typecode(size: int, signed: bool = False) -> str:
+    # Pick the array typecode with an exact item size, since 'I', 'L' etc. vary by platform
+    for code in ('hilq' if signed else 'HILQ'):
+        if array(code).itemsize == size:
+            return code
+    raise RuntimeError(f"No array typecode with an item size of {size} bytes.")
+
+
+_U16 = _typecode(2)
+_U32 = _typecode(4)
+_U64 = _typecode(8)
+_I32 = _typecode(4, signed=True)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so that rewordings in case, spacing and punctuation compare equal.
+
+    Punctuation and symbols are dropped by Unicode category rather than with \\W,
+    so Devanagari vowel signs are kept.
+    """
+    text = unicodedata.normalize('NFKC', str(text)).lower()
+    text = ''.join(' ' if unicodedata.category(ch)[0] in 'PS' else ch for ch in text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def normalize_choices(choices) -> List[str]:
+    """
+    Normalize answer choices, ignoring their labels and order.
+
+    Args:
+        choices: Either a dict of option letter -> text, or a list of option texts.
+
+    Returns:
+        List[str]: The sorted, normalized choice texts.
+    """
+    if isinstance(choices, dict):
+        choices = choices.values()
+    return sorted(normalize_text(choice) for choice in (choices or []))
+
+
+def answer_text(question: Dict) -> str:
+    """Resolve a question's answer (usually an option letter) to the normalized text of the correct choice."""
+    answer = question.get('answer')
+    if answer is None:
+        return ''
+    choices = question.get('choices')
+    letter = str(answer).strip().lower()
+    if isinstance(choices, dict) and letter in choices:
+        return normalize_text(choices[letter])
+    if isinstance(choices, list) and len(letter) == 1 and letter in _OPTION_LETTERS[:len(choices)]:
+        return normalize_text(choices[_OPTION_LETTERS.index(letter)])
+    return normalize_text(answer)
+
+
+def _script(token: str) -> str:
+    for ch in token:
+        if ch.isdigit():
+            return 'DIGIT'
+        if ch.isalpha():
+            return unicodedata.name(ch, 'UNKNOWN').split()[0]
+    return 'UNKNOWN'
+
+
+def question_anchors(text: str) -> set:
+    """
+    Extract the words that name what a question is about.
+
+    These are words in quotes or parentheses, numbers, and words written in a
+    different script from most of the question (e.g. a Hindi noun in an English
+    question). Questions that differ only in these words ask about different things.
+    """
+    text = unicodedata.normalize('NFKC', str(text))
+    anchors = set()
+    for span in _QUOTED.findall(text) + _PARENTHESIZED.findall(text):
+        anchors.update(normalize_text(span).split())
+    tokens = normalize_text(text).split()
+    scripts = [_script(token) for token in tokens]
+    counts = Counter(s for s in scripts if s not in ('DIGIT', 'UNKNOWN'))
+    dominant = counts.most_common(1)[0][0] if counts else None
+    anchors.update(token for token, s in zip(tokens, scripts) if s == 'DIGIT' or s != dominant)
+    return anchors
+
+
+def text_shingles(text: str, k: int = 3) -> set:
+    """
+    Build the set of character k-grams of the normalized text.
+
+    Character grams keep most of their overlap when a single word is swapped
+    or a clause is moved, unlike word k-grams on short questions.
+    """
+    text = normalize_text(text)
+    if not text:
+        return set()
+    padded = f" {text} "
+    if len(padded) <= k:
+        return {padded}
+    return {padded[i:i + k] for i in range(len(padded) - k + 1)}
+
+
+def _stable_hash(value: str) -> int:
+    # blake2b rather than hash() so signatures stay stable across processes
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+def _choice_mask(choices: Iterable[str]) -> int:
+    mask = 0
+    for choice in choices:
+        mask |= 1 << (_stable_hash(choice) & 63)
+    return mask
+
+
+def _word_sketch(words: Iterable[str], size: int) -> Tuple[int, ...]:
+    # The smallest `size` distinct 16-bit word hashes (0 is reserved for empty slots)
+    return tuple(sorted({_stable_hash(word) & 0xFFFF or 1 for word in words})[:size])
+
+
+def _replaces_words(sketch_a: Iterable[int], sketch_b: Iterable[int], size: int) -> bool:
+    a = [h for h in sketch_a if h]
+    b = [h for h in sketch_b if h]
+    # A full sketch only covers hashes up to its largest one, so compare below both limits
+    limit = min(a[-1] if len(a) == size else 0xFFFF, b[-1] if len(b) == size else 0xFFFF)
+    a = {h for h in a if h <= limit}
+    b = {h for h in b if h <= limit}
+    return bool(a - b) and bool(b - a)
+
+
+class Signature(NamedTuple):
+    group: int
+    anchored: bool
+    choices: int
+    words: Tuple[int, ...]
+    minhashes: array
+
+
+class QuestionIndex:
+    """
+    Near-duplicate index over generated questions using MinHash signatures and LSH banding.
+
+    Two questions are near-duplicates when they have the same correct answer and the
+    same anchor words (see `question_anchors`), their choice sets overlap enough, and
+    their texts are similar (estimated Jaccard over character 3-grams). Rewordings
+    around the same anchors only need `text_threshold`. Without anchors nothing marks
+    the subject of a question, so there it needs the stricter `unanchored_threshold`
+    and no word may have been replaced by another (words may only be added, dropped
+    or moved). Only word hashes are kept, not text, so a changed word cannot be checked
+    for being a mere spelling variant.
+
+    The answer and anchors are folded into the LSH band keys, so lookups only touch
+    questions about the same thing and never scan the whole bank. Each band bucket
+    holds at most `max_bucket` entries, so heavily templated questions cannot make
+    lookups linear.
+
+    Entries are kept in packed arrays used as a ring buffer, and the band buckets in an
+    open-addressing table of slot numbers, so an entry costs about 230 bytes. The default
+    capacity of 300,000 therefore stays around 70 MB; memory is allocated as entries are
+    added, and the oldest entries are overwritten once the index is full. All public
+    methods are safe to call from several threads.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 8, rows: int = 2, text_threshold: float = 0.5,
+                 unanchored_threshold: float = 0.8, choice_threshold: float = 0.5,
+                 capacity: int = 300_000, seed: int = 1, sketch_words: int = 16, max_bucket: int = 8) -> None:
+        if bands * rows > num_perm:
+            raise ValueError("bands * rows must not exceed num_perm.")
+        for threshold in (text_threshold, unanchored_threshold, choice_threshold):
+            if not 0.0 <= threshold <= 1.0:
+                raise ValueError("Thresholds must be between 0 and 1.")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = rows
+        self.text_threshold = text_threshold
+        self.unanchored_threshold = unanchored_threshold
+        self.choice_threshold = choice_threshold
+        self.capacity = capacity
+        self.seed = seed
+        self.sketch_words = sketch_words
+        self.max_bucket = max_bucket
+
+        self._salt = f"{seed}:".encode('utf-8')
+        self._lock = threading.RLock()
+        # Slot i holds entry id (first id + i) modulo capacity, see _slot_id
+        self._groups = array(_U32)
+        self._choices = array(_U64)
+        self._words = array(_U16)
+        self._minhashes = array(_U16)
+        # Open-addressing table of slot numbers (-1 = empty) with a 32-bit fingerprint of
+        # each cell's band key, probed by double hashing. Overwritten slots leave stale cells behind;
+        # candidates are always re-checked, and stale cells are dropped when the table is rebuilt.
+        self._table = array(_I32, [-1]) * 64
+        self._fingerprints = array(_U32, [0]) * 64
+        self._used_cells = 0
+        self._next_id = 0
+        self._persisted_path: Optional[str] = None
+        self._persisted_records = 0
+        self._flushed_id = 0
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return self._next_id - len(self) <= entry_id < self._next_id
+
+    def _slot_id(self, slot: int) -> int:
+        first = self._next_id - len(self)
+        return first + (slot - first) % self.capacity
+
+    def signature(self, question: Dict) -> Optional[Signature]:
+        """
+        Compute the signature of a question.
+
+        Returns:
+            Optional[Signature]: The signature, or None if the question has no text to index.
+        """
+        text = question.get('text', '')
+        shingles = text_shingles(text)
+        if not shingles:
+            return None
+        size = struct.calcsize(f'<{self.num_perm}H')
+        # One extendable-output digest gives an independent 16-bit hash per permutation
+        rows = [struct.unpack(f'<{self.num_perm}H', hashlib.shake_128(self._salt + s.encode('utf-8')).digest(size))
+                for s in shingles]
+        anchors = question_anchors(text)
+        return Signature(
+            group=_stable_hash(answer_text(question) + '\x1f' + '\x1f'.join(sorted(anchors))),
+            anchored=bool(anchors),
+            choices=_choice_mask(normalize_choices(question.get('choices'))),
+            words=_word_sketch(normalize_text(text).split(), self.sketch_words),
+            minhashes=array(_U16, [min(column) for column in zip(*rows)]),
+        )
+
+    def _band_key(self, band: int, group: int, minhashes, offset: int = 0) -> int:
+        start = offset + band * self.rows
+        return hash((band, group) + tuple(minhashes[start:start + self.rows]))
+
+    def _slot_band_key(self, slot: int, band: int) -> int:
+        return self._band_key(band, self._groups[slot], self._minhashes, slot * self.num_perm)
+
+    def _probe(self, key: int) -> Iterator[int]:
+        # Yields the slots of cells whose fingerprint matches the key
+        mask = len(self._table) - 1
+        fingerprint = (key >> 32) & 0xFFFFFFFF
+        # Double hashing: an odd step visits every cell and keeps different keys from piling up
+        cell, step = key & mask, (key >> 16) & mask | 1
+        while self._table[cell] != -1:
+            if self._fingerprints[cell] == fingerprint:
+                yield self._table[cell]
+            cell = (cell + step) & mask
+
+    def _rebuild_table(self, extra: int = 0) -> None:
+        needed = (len(self) + extra) * self.bands
+        size = 64
+        while size < 2 * needed:
+            size *= 2
+        self._table = array(_I32, [-1]) * size
+        self._fingerprints = array(_U32, [0]) * size
+        self._used_cells = 0
+        for slot in range(len(self)):
+            self._index_slot(slot)
+
+    def _index_slot(self, slot: int) -> None:
+        for band in range(self.bands):
+            key = self._slot_band_key(slot, band)
+            # Keys shared by a whole template family stop growing; the other bands still match
+            if sum(1 for _ in zip(range(self.max_bucket), self._probe(key))) < self.max_bucket:
+                self._place(key, slot)
+
+    def _place(self, key: int, slot: int) -> None:
+        mask = len(self._table) - 1
+        cell, step = key & mask, (key >> 16) & mask | 1
+        while self._table[cell] != -1:
+            cell = (cell + step) & mask
+        self._table[cell] = slot
+        self._fingerprints[cell] = (key >> 32) & 0xFFFFFFFF
+        self._used_cells += 1
+
+    def _candidates(self, signature: Signature) -> set:
+        slots = set()
+        for band in range(self.bands):
+            key = self._band_key(band, signature.group, signature.minhashes)
+            slots.update(slot for slot in self._probe(key) if slot < len(self))
+        return slots
+
+    def _find(self, signature: Signature) -> Optional[Tuple[int, float]]:
+        threshold = self.text_threshold if signature.anchored else self.unanchored_threshold
+        best = None
+        for slot in self._candidates(signature):
+            if self._groups[slot] != signature.group:
+                continue
+            union = _popcount(self._choices[slot] | signature.choices)
+            overlap = _popcount(self._choices[slot] & signature.choices) / union if union else 1.0
+            if overlap < self.choice_threshold:
+                continue
+            start = slot * self.num_perm
+            stored = self._minhashes[start:start + self.num_perm]
+            score = sum(map(operator.eq, stored, signature.minhashes)) / self.num_perm
+            if score < threshold or (best is not None and score <= best[1]):
+                continue
+            start = slot * self.sketch_words
+            if not signature.anchored and _replaces_words(
+                    self._words[start:start + self.sketch_words], signature.words, self.sketch_words):
+                continue
+            best = (self._slot_id(slot), score)
+        return best
+
+    def query(self, question: Dict) -> Optional[Tuple[int, float]]:
+        """
+        Look up the closest indexed near-duplicate of a question.
+
+        Returns:
+            Optional[Tuple[int, float]]: The matching entry id and estimated text similarity, or None.
+        """
+        signature = self.signature(question)
+        if signature is None:
+            return None
+        with self._lock:
+            return self._find(signature)
+
+    def is_duplicate(self, question: Dict) -> bool:
+        return self.query(question) is not None
+
+    def _padded_words(self, signature: Signature) -> array:
+        return array(_U16, signature.words + (0,) * (self.sketch_words - len(signature.words)))
+
+    def _insert(self, signature: Signature) -> int:
+        if self._used_cells + self.bands > 0.75 * len(self._table):
+            self._rebuild_table(extra=1)
+        entry_id = self._next_id
+        slot = entry_id % self.capacity
+        if slot == len(self):
+            self._groups.append(signature.group)
+            self._choices.append(signature.choices)
+            self._words.extend(self._padded_words(signature))
+            self._minhashes.extend(signature.minhashes)
+        else:
+            self._groups[slot] = signature.group
+            self._choices[slot] = signature.choices
+            self._words[slot * self.sketch_words:(slot + 1) * self.sketch_words] = self._padded_words(signature)
+            self._minhashes[slot * self.num_perm:(slot + 1) * self.num_perm] = signature.minhashes
+        self._next_id += 1
+        self._index_slot(slot)
+        return entry_id
+
+    def add(self, question: Dict) -> bool:
+        """
+        Insert a question unless a near-duplicate is already indexed.
+
+        Questions without any text are accepted but not indexed, so they are never
+        mistaken for duplicates of each other.
+
+        Args:
+            question (Dict): A question with 'text', 'choices' and 'answer'.
+
+        Returns:
+            bool: False if the question was rejected as a duplicate, True otherwise.
+        """
+        signature = self.signature(question) if isinstance(question, dict) else None
+        if signature is None:
+            logger.warning(f"Question has no text to index, skipping: {question!r}")
+            return True
+        with self._lock:
+            match = self._find(signature)
+            if match is not None:
+                logger.debug(f"Rejected near-duplicate of entry {match[0]} (similarity {match[1]:.2f})")
+                return False
+            self._insert(signature)
+        return True
+
+    def filter(self, questions: List[Dict]) -> List[Dict]:
+        """Return only the questions that are new, indexing them as they are accepted."""
+        unique = [q for q in questions if self.add(q)]
+        rejected = len(questions) - len(unique)
+        if rejected:
+            logger.info(f"Dropped {rejected} near-duplicate question(s).")
+        return unique
+
+    def update(self, questions: Iterable[Dict]) -> int:
+        """
+        Incrementally index questions from an existing bank, skipping duplicates.
+
+        Returns:
+            int: The number of questions that were accepted.
+        """
+        return sum(1 for q in questions if self.add(q))
+
+    def rebuild(self, questions: Iterable[Dict]) -> int:
+        """Clear the index and re-index the given questions, streaming them one at a time."""
+        with self._lock:
+            self._groups = array(_U32)
+            self._choices = array(_U64)
+            self._words = array(_U16)
+            self._minhashes = array(_U16)
+            self._rebuild_table()
+            self._next_id = 0
+            self._flushed_id = 0
+            return self.update(questions)
+
+    def _record(self, entry_id: int) -> str:
+        slot = entry_id % self.capacity
+        minhashes = self._minhashes[slot * self.num_perm:(slot + 1) * self.num_perm]
+        # Packed explicitly little-endian so files load on any platform
+        packed = struct.pack(f'<{self.num_perm}H', *minhashes).hex()
+        words = [h for h in self._words[slot * self.sketch_words:(slot + 1) * self.sketch_words] if h]
+        return json.dumps([self._groups[slot], self._choices[slot], words, packed])
+
+    def _header(self) -> str:
+        return json.dumps({
+            "format": _FORMAT_VERSION,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+            "text_threshold": self.text_threshold,
+            "unanchored_threshold": self.unanchored_threshold,
+            "choice_threshold": self.choice_threshold,
+            "capacity": self.capacity,
+            "seed": self.seed,
+            "sketch_words": self.sketch_words,
+            "max_bucket": self.max_bucket,
+        })
+
+    def save(self, path: str) -> None:
+        """Write the whole index to `path`, replacing it atomically through a unique temporary file."""
+        with self._lock:
+            lines = [self._header()]
+            lines.extend(self._record(entry_id) for entry_id in range(self._next_id - len(self), self._next_id))
+            directory = os.path.dirname(os.path.abspath(path))
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, suffix='.tmp',
+                                             delete=False) as f:
+                f.write('\n'.join(lines) + '\n')
+            try:
+                os.replace(f.name, path)
+            except OSError:
+                os.unlink(f.name)
+                raise
+            self._persisted_path = path
+            self._persisted_records = len(self)
+            self._flushed_id = self._next_id
+
+    def flush(self, path: str) -> None:
+        """
+        Persist entries added since the last save or flush by appending them to `path`.
+
+        The file is rewritten with `save` instead when it was not written by this index,
+        or when it has grown to twice the capacity, which drops evicted entries.
+        """
+        with self._lock:
+            start = max(self._flushed_id, self._next_id - len(self))
+            pending = self._next_id - start
+            if (self._persisted_path != path or not os.path.exists(path)
+                    or self._persisted_records + pending > 2 * self.capacity):
+                self.save(path)
+                return
+            if not pending:
+                return
+            records = ''.join(self._record(entry_id) + '\n' for entry_id in range(start, self._next_id))
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(records)
+            self._persisted_records += pending
+            self._flushed_id = self._next_id
+
+    @classmethod
+    def load(cls, path: str) -> "QuestionIndex":
+        """
+        Load an index written by `save`/`flush`, so new questions can be added without re-hashing old ones.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a valid index.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        try:
+            header = json.loads(lines[0])
+            if header["format"] != _FORMAT_VERSION:
+                raise ValueError(f"unsupported format {header['format']!r}")
+            index = cls(num_perm=header["num_perm"], bands=header["bands"], rows=header["rows"],
+                        text_threshold=header["text_threshold"],
+                        unanchored_threshold=header["unanchored_threshold"],
+                        choice_threshold=header["choice_threshold"],
+                        capacity=header["capacity"], seed=header["seed"],
+                        sketch_words=header["sketch_words"], max_bucket=header["max_bucket"])
+            # Older records beyond the capacity would be evicted anyway, so only the newest are read
+            for line in lines[1:][-index.capacity:]:
+                group, choices, words, packed = json.loads(line)
+                # Anchoring only affects the query side of a comparison, so it is not stored
+                signature = Signature(group=group, anchored=True, choices=choices,
+                                      words=tuple(words)[:index.sketch_words],
+                                      minhashes=array(_U16, struct.unpack(f'<{index.num_perm}H',
+                                                                          bytes.fromhex(packed))))
+                index._groups.append(signature.group)
+                index._choices.append(signature.choices)
+                index._words.extend(index._padded_words(signature))
+                index._minhashes.extend(signature.minhashes)
+            index._next_id = len(index)
+            index._rebuild_table()
+        except (IndexError, KeyError, TypeError, OverflowError, struct.error, ValueError) as e:
+            raise ValueError(f"Invalid question index file {path}: {e}") from e
+        index._persisted_path = path
+        index._persisted_records = len(lines) - 1
+        index._flushed_id = index._next_id
+        return index
+
+
+_BENCHMARK_TEMPLATES = [
+    "What is the Hindi word for '{s}'?",
+    "Which Hindi word is used for '{s}' in everyday speech?",
+    "Choose the correct Hindi translation of '{s}'.",
+    "What is the plural form of '{s}' in Hindi?",
+    "Which gender does the Hindi noun for '{s}' take?",
+]
+
+_BENCHMARK_SYNONYMS = {
+    "word": "term", "what": "which", "choose": "select", "correct": "right",
+    "used": "said", "everyday": "daily", "form": "version", "take": "have",
+}
+
+_GENDER_TEMPLATES = [
+    "What is the gender of the Hindi noun '{h}' ({s})?",
+    "{h} का लिंग क्या है?",
+]
+
+_GENDER_CHOICES = {'a': 'Masculine', 'b': 'Feminine', 'c': 'Neuter', 'd': 'Both'}
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9)))
+
+
+def _hindi_word(rng: random.Random) -> str:
+    return ''.join(rng.choices([chr(c) for c in range(0x0915, 0x0939)], k=rng.randint(3, 6)))
+
+
+def _benchmark_question(rng: random.Random, template: str, subject: str, answers: List[str]) -> Dict:
+    options = rng.sample(answers, 4)
+    return {
+        "text": template.format(s=subject),
+        "choices": dict(zip('abcd', options)),
+        "answer": rng.choice('abcd'),
+    }
+
+
+def _gender_question(rng: random.Random, template: str, noun: str, subject: str) -> Dict:
+    return {
+        "text": template.format(h=noun, s=subject),
+        "choices": dict(_GENDER_CHOICES),
+        "answer": rng.choice('ab'),
+    }
+
+
+def _reworded(rng: random.Random, question: Dict) -> Dict:
+    words = question["text"].split()
+    swappable = [i for i, w in enumerate(words) if w.lower() in _BENCHMARK_SYNONYMS]
+    for i in rng.sample(swappable, min(len(swappable), rng.randint(1, 2))):
+        words[i] = _BENCHMARK_SYNONYMS[words[i].lower()]
+    choices = list(question["choices"].values())
+    correct = question["choices"][question["answer"]]
+    rng.shuffle(choices)
+    return {
+        "text": ' '.join(words).upper(),
+        "choices": dict(zip('abcd', choices)),
+        "answer": 'abcd'[choices.index(correct)],
+    }
+
+
+def benchmark(n: int = 10_000, seed: int = 0) -> Dict[str, float]:
+    """
+    Measure insert/query throughput, accuracy and memory on synthetic quiz questions.
+
+    Indexes `n` questions built from a few shared templates plus `n` gender questions
+    that all share one fixed choice set, then queries a rewording of each (synonym swaps,
+    shuffled choices) and three sets of `n` distinct questions: new
+    subjects drawing from the same pool of choices, different questions reusing the
+    choices and answer of an indexed one, and gender questions about other nouns.
+
+    Returns:
+        Dict[str, float]: Throughput in items per second, duplicate recall, the false
+        positive rate of each distinct set and index memory per entry in bytes.
+    """
+    rng = random.Random(seed)
+    answers = list({_hindi_word(rng) for _ in range(2000)})
+    subjects = list({_pseudo_word(rng) for _ in range(5 * n)})
+    nouns = list({_hindi_word(rng) for _ in range(3 * n)})
+    pairs = [(rng.choice(_BENCHMARK_TEMPLATES), subject) for subject in subjects]
+    questions = [_benchmark_question(rng, t, s, answers) for t, s in pairs[:n]]
+    genders = [_gender_question(rng, rng.choice(_GENDER_TEMPLATES), h, s)
+               for h, s in zip(nouns[:n], subjects[3 * n:4 * n])]
+    duplicates = [_reworded(rng, q) for q in questions + genders]
+    distinct = {
+        "false_positive_rate": [_benchmark_question(rng, t, s, answers) for t, s in pairs[n:2 * n]],
+        "same_answer_false_positive_rate": [
+            dict(q, text=rng.choice([t for t in _BENCHMARK_TEMPLATES if t != template]).format(s=subject))
+            for q, (template, _), (_, subject) in zip(questions, pairs, pairs[2 * n:])],
+        "fixed_choices_false_positive_rate": [
+            _gender_question(rng, rng.choice(_GENDER_TEMPLATES), h, s)
+            for h, s in zip(nouns[n:2 * n], subjects[4 * n:])],
+    }
+
+    index = QuestionIndex(capacity=2 * n)
+    start = time.perf_counter()
+    inserted = index.update(questions + genders)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(1 for q in duplicates if index.is_duplicate(q))
+    positives = {name: sum(1 for q in items if index.is_duplicate(q)) for name, items in distinct.items()}
+    query_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    measured = QuestionIndex(capacity=2 * n)
+    measured.update(questions + genders)
+    index_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    results = {
+        "inserted": inserted,
+        "inserts_per_sec": round(2 * n / insert_time, 2),
+        "queries_per_sec": round(5 * n / query_time, 2),
+        "duplicate_recall": round(found / (2 * n), 4),
+    }
+    results.update({name: round(count / n, 4) for name, count in positives.items()})
+    results["bytes_per_entry"] = round(index_bytes / max(len(measured), 1))
+    return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.info(json.dumps(benchmark(), indent=4))
@@ -0,0 +1,99 @@
+import pytest
+
+pytest.importorskip("groq")
+
+from Learner import AssessmentEngine
+from question_index import QuestionIndex
+
+
+def make_question(subject, answer='a'):
+    return {
+        'text': f"What is the Hindi word for '{subject}'?",
+        'choices': {'a': f'{subject}-a', 'b': f'{subject}-b', 'c': f'{subject}-c', 'd': f'{subject}-d'},
+        'answer': answer,
+    }
+
+
+class FakeRequests:
+    """Stands in for AssessmentEngine._request_questions, returning queued batches and recording calls."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.calls = []
+
+    def __call__(self, skill_level, count, temperature, avoid):
+        self.calls.append({'count': count, 'temperature': temperature, 'avoid': list(avoid)})
+        return self.batches.pop(0) if self.batches else []
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.delenv('QUESTION_INDEX_PATH', raising=False)
+    return AssessmentEngine(question_index=QuestionIndex())
+
+
+def test_returns_first_batch_when_all_questions_are_new(engine):
+    batch = [make_question(f"thing{i}") for i in range(3)]
+    engine._request_questions = FakeRequests(batch)
+
+    assert engine.question_generator('Beginner', num_questions=3) == batch
+    assert engine._request_questions.calls == [{'count': 3, 'temperature': 0, 'avoid': []}]
+
+
+def test_retries_for_replacements_with_avoid_list_and_temperature(engine):
+    engine.question_index.add(make_question("seen"))
+    first = [make_question("seen"), make_question("new1")]
+    engine._request_questions = FakeRequests(first, [make_question("new2")])
+
+    questions = engine.question_generator('Beginner', num_questions=2)
+
+    assert [q['text'] for q in questions] == [make_question("new1")['text'], make_question("new2")['text']]
+    retry = engine._request_questions.calls[1]
+    assert retry['count'] == 1
+    assert retry['temperature'] == 0.2
+    assert set(retry['avoid']) == {make_question("seen")['text'], make_question("new1")['text']}
+
+
+def test_stops_after_max_attempts_and_fills_with_duplicates(engine):
+    engine.question_index.update([make_question("seen1"), make_question("seen2")])
+    repeated = [make_question("seen1"), make_question("seen2")]
+    engine._request_questions = FakeRequests(repeated, repeated, repeated, repeated)
+
+    questions = engine.question_generator('Beginner', num_questions=2, max_attempts=3)
+
+    assert len(engine._request_questions.calls) == 3
+    assert questions == repeated
+
+
+def test_returns_none_only_when_first_request_fails(engine):
+    engine._request_questions = FakeRequests(None)
+    assert engine.question_generator('Beginner', num_questions=2) is None
+
+    engine.question_index.add(make_question("seen"))
+    engine._request_questions = FakeRequests([make_question("seen"), make_question("new")], None)
+    questions = engine.question_generator('Beginner', num_questions=2)
+    assert [q['text'] for q in questions] == [make_question("new")['text'], make_question("seen")['text']]
+
+
+def test_rejects_max_attempts_below_one(engine):
+    engine._request_questions = FakeRequests([make_question("thing")])
+    with pytest.raises(ValueError):
+        engine.question_generator('Beginner', max_attempts=0)
+
+
+def test_persists_index_to_configured_path(monkeypatch, tmp_path):
+    path = tmp_path / "index.jsonl"
+    monkeypatch.setenv('QUESTION_INDEX_PATH', str(path))
+    engine = AssessmentEngine()
+    engine._request_questions = FakeRequests([make_question("thing")])
+    engine.question_generator('Beginner', num_questions=1)
+
+    assert QuestionIndex.load(str(path)).is_duplicate(make_question("thing"))
+    assert AssessmentEngine().question_index.is_duplicate(make_question("thing"))
+
+
+def test_starts_fresh_index_when_file_is_invalid(monkeypatch, tmp_path):
+    path = tmp_path / "index.jsonl"
+    path.write_text('{"format": 1, "num_perm": "x"}\n')
+    monkeypatch.setenv('QUESTION_INDEX_PATH', str(path))
+    assert len(AssessmentEngine().question_index) == 0
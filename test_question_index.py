@@ -0,0 +1,218 @@
+import json
+import threading
+
+import pytest
+
+from question_index import QuestionIndex, normalize_text, normalize_choices, answer_text, question_anchors
+
+
+CHOICES = {'a': 'सेब', 'b': 'केला', 'c': 'आम', 'd': 'संतरा'}
+GENDERS = {'a': 'Masculine', 'b': 'Feminine', 'c': 'Neuter', 'd': 'Both'}
+
+
+def make_question(text, choices=None, answer='a'):
+    return {'text': text, 'choices': dict(choices or CHOICES), 'answer': answer}
+
+
+def apple_question():
+    return make_question("What is the Hindi word for 'apple'?")
+
+
+def test_normalize_text_ignores_case_spacing_and_punctuation():
+    assert normalize_text("  What IS the   word, for 'apple'?! ") == "what is the word for apple"
+
+
+def test_normalize_text_keeps_devanagari_vowel_signs():
+    assert normalize_text("सेब।") == "सेब"
+
+
+def test_normalize_choices_ignores_labels_and_order():
+    assert normalize_choices({'a': 'Two', 'b': 'one'}) == normalize_choices(['ONE', 'two'])
+
+
+def test_answer_text_resolves_option_letter():
+    assert answer_text(apple_question()) == 'सेब'
+    assert answer_text({'text': 'x', 'choices': ['one', 'two'], 'answer': 'b'}) == 'two'
+
+
+def test_question_anchors():
+    assert question_anchors("What is the gender of the Hindi noun 'किताब' (book)?") == {'किताब', 'book'}
+    assert question_anchors("What's the Hindi word for 'apple'?") == {'apple'}
+    assert question_anchors("What is the gender of किताब?") == {'किताब'}
+    assert question_anchors("How do you say 5 in Hindi?") == {'5'}
+    assert question_anchors("किताब का लिंग क्या है?") == set()
+
+
+def test_reworded_question_with_shuffled_choices_is_duplicate():
+    index = QuestionIndex()
+    assert index.add(apple_question())
+    shuffled = dict(zip('abcd', ['आम', 'संतरा', 'सेब', 'केला']))
+    assert index.is_duplicate(make_question("What is the Hindi term for 'apple'?", shuffled, answer='c'))
+    assert index.is_duplicate(make_question("In Hindi, what is the word for 'apple'?"))
+
+
+def test_question_with_different_answer_is_not_duplicate():
+    index = QuestionIndex()
+    index.add(apple_question())
+    assert not index.is_duplicate(make_question("What is the Hindi word for 'banana'?", answer='b'))
+
+
+def test_different_question_with_same_answer_is_not_duplicate():
+    index = QuestionIndex()
+    index.add(apple_question())
+    assert not index.is_duplicate(make_question("Which fruit is red and grows on trees?"))
+
+
+def test_fixed_choice_questions_about_different_words_are_not_duplicates():
+    index = QuestionIndex()
+    index.add(make_question("What is the gender of the Hindi noun 'किताब' (book)?", GENDERS, answer='b'))
+    index.add(make_question("किताब का लिंग क्या है?", GENDERS, answer='b'))
+    for text in ["What is the gender of the Hindi noun 'मेज़' (table)?",
+                 "What is the gender of the Hindi noun 'कुर्सी' (chair)?",
+                 "What is the gender of the Hindi noun 'रात' (night)?",
+                 "मेज़ का लिंग क्या है?",
+                 "रात का लिंग क्या है?"]:
+        assert not index.is_duplicate(make_question(text, GENDERS, answer='b')), text
+
+
+def test_fixed_choice_rewordings_are_duplicates():
+    index = QuestionIndex()
+    index.add(make_question("What is the gender of the Hindi noun 'किताब' (book)?", GENDERS, answer='b'))
+    index.add(make_question("किताब का लिंग क्या है?", GENDERS, answer='b'))
+    assert index.is_duplicate(make_question("What gender is the Hindi noun 'किताब' (book)?", GENDERS, answer='b'))
+    assert index.is_duplicate(make_question("किताब का लिंग क्या होता है?", GENDERS, answer='b'))
+
+
+def test_filter_drops_duplicates_within_and_across_batches():
+    index = QuestionIndex()
+    batch = [apple_question(), make_question("What is the Hindi word for 'banana'?", answer='b')]
+    assert index.filter(batch + [apple_question()]) == batch
+    assert index.filter(batch) == []
+
+
+def test_questions_without_text_are_kept_but_not_indexed():
+    index = QuestionIndex()
+    items = [{'question': 'one', 'options': ['x']}, {'question': 'two', 'options': ['y']}]
+    assert index.filter(items) == items
+    assert len(index) == 0
+
+
+def test_eviction_drops_oldest_entries():
+    index = QuestionIndex(capacity=2)
+    questions = [make_question(f"What is the Hindi word for 'thing{i}'?", answer=letter)
+                 for i, letter in enumerate('abcd')]
+    assert index.update(questions) == 4
+    assert len(index) == 2
+    assert 0 not in index and 1 not in index
+    assert 2 in index and 3 in index
+    assert not index.is_duplicate(questions[0])
+    assert index.is_duplicate(questions[3])
+    assert index.add(questions[0])
+    assert index.is_duplicate(questions[0])
+    assert not index.is_duplicate(questions[2])
+
+
+def test_rebuild_replaces_contents():
+    index = QuestionIndex()
+    index.add(apple_question())
+    banana = make_question("What is the Hindi word for 'banana'?", answer='b')
+    assert index.rebuild([banana, banana]) == 1
+    assert len(index) == 1
+    assert not index.is_duplicate(apple_question())
+    assert index.is_duplicate(banana)
+
+
+def test_concurrent_adds_and_saves(tmp_path):
+    index = QuestionIndex(capacity=50)
+    path = str(tmp_path / "index.jsonl")
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(40):
+                index.add(make_question(f"What is the Hindi word for 'thing{offset}x{i}'?"))
+                index.flush(path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(index) == 50
+    assert len(QuestionIndex.load(path)) == 50
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = QuestionIndex(capacity=10)
+    index.add(apple_question())
+    path = str(tmp_path / "index.json")
+    index.save(path)
+
+    loaded = QuestionIndex.load(path)
+    assert len(loaded) == 1
+    assert loaded.capacity == 10
+    assert loaded.is_duplicate(make_question("What is the Hindi term for 'apple'?"))
+    assert loaded.add(make_question("What is the Hindi word for 'banana'?", answer='b'))
+    assert len(loaded) == 2
+
+
+def test_flush_appends_new_entries(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = QuestionIndex(capacity=10)
+    index.add(apple_question())
+    index.flush(path)
+    index.add(make_question("What is the Hindi word for 'banana'?", answer='b'))
+    index.flush(path)
+    with open(path, encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 3
+
+    loaded = QuestionIndex.load(path)
+    assert len(loaded) == 2
+    assert loaded.is_duplicate(make_question("What is the Hindi term for 'banana'?", answer='b'))
+
+
+def test_flush_compacts_file_beyond_twice_capacity(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = QuestionIndex(capacity=2)
+    for i in range(6):
+        index.add(make_question(f"What is the Hindi word for 'thing{i}'?"))
+        index.flush(path)
+    with open(path, encoding='utf-8') as f:
+        assert len(f.read().splitlines()) <= 1 + 2 * index.capacity
+    assert len(QuestionIndex.load(path)) == 2
+
+
+def test_load_rejects_malformed_file(tmp_path):
+    path = tmp_path / "index.jsonl"
+    header = json.loads(QuestionIndex()._header())
+    path.write_text(json.dumps(header) + '\n[1, 2]\n')
+    with pytest.raises(ValueError):
+        QuestionIndex.load(str(path))
+    path.write_text('{"format": 1, "num_perm": "x"}\n')
+    with pytest.raises(ValueError):
+        QuestionIndex.load(str(path))
+
+
+def test_negative_seed_round_trip(tmp_path):
+    index = QuestionIndex(seed=-7)
+    index.add(apple_question())
+    path = str(tmp_path / "index.jsonl")
+    index.save(path)
+    assert QuestionIndex.load(path).is_duplicate(apple_question())
+
+
+def test_load_keeps_newest_records_up_to_capacity(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = QuestionIndex(capacity=2)
+    questions = [make_question(f"What is the Hindi word for 'thing{i}'?") for i in range(3)]
+    for q in questions:
+        index.add(q)
+        index.flush(path)
+
+    loaded = QuestionIndex.load(path)
+    assert len(loaded) == 2
+    assert not loaded.is_duplicate(questions[0])
+    assert loaded.is_duplicate(questions[1]) and loaded.is_duplicate(questions[2])